@@ -0,0 +1,21 @@
+"""
+pytest configuration for the Event Reporting System tests
+Run against a live server with: pytest -n auto test_system.py (-n needs pytest-xdist)
+"""
+
+import pytest
+
+from test_system import API_BASE, ENDPOINTS, SESSION, wait_ready
+
+@pytest.fixture(scope="session")
+def session():
+    """Pooled HTTP session shared by the tests in one worker; skips them if the server is down"""
+    if not wait_ready(SESSION):
+        pytest.skip(f"Server not running at {API_BASE}")
+    yield SESSION
+    SESSION.close()
+
+def pytest_generate_tests(metafunc):
+    """Run test_endpoint once per ENDPOINTS entry, so xdist can spread them across workers"""
+    if "endpoint" in metafunc.fixturenames:
+        metafunc.parametrize("endpoint", ENDPOINTS, ids=[endpoint.id for endpoint in ENDPOINTS])
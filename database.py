@@ -1,51 +1,150 @@
 """
 Database configuration and models for the Event Reporting System
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, UniqueConstraint
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
+from sqlalchemy import create_engine, event, insert, inspect, String, DateTime, ForeignKey, Text, UniqueConstraint, Index, SmallInteger
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker, relationship
+from sqlalchemy.sql import func
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime, timezone
+from typing import List, Optional
 import os
 
+from models import RegistrationStatus, AttendanceStatus
+
 # Database URL - using SQLite for prototype, easily switchable to PostgreSQL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./event_management.db")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL statement logging is off by default; set SQL_ECHO=1 to see queries while developing
+SQL_ECHO = os.getenv("SQL_ECHO") == "1"
+
+def _engine_options(url):
+    """Connection pool settings for the configured database"""
+    if url.startswith("sqlite"):
+        # SQLite connections are shared across FastAPI's worker threads
+        options = {"connect_args": {"check_same_thread": False}}
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # An in-memory database only exists on its one connection
+            options["poolclass"] = StaticPool
+            return options
+    else:
+        options = {}
+    
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+    return options
+
+# insertmanyvalues_page_size bounds how many rows go into each batched INSERT
+engine = create_engine(
+    DATABASE_URL,
+    echo=SQL_ECHO,
+    future=True,
+    insertmanyvalues_page_size=1000,
+    **_engine_options(DATABASE_URL)
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL journaling and relaxed syncing so commits are not fsync-bound"""
+        cursor = dbapi_connection.cursor()
+        # SQLite leaves foreign keys unenforced unless asked, per connection
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+
+class EnumCode(TypeDecorator):
+    """Store a str Enum as a SmallInteger code, numbered in member declaration order
+    
+    Only ever append new members: the codes of existing ones are already on disk.
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class):
+        super().__init__()
+        self.enum_class = enum_class
+        self._members = list(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+    
+    def process_bind_param(self, value, dialect):
+        # Plain strings such as "registered" are accepted too
+        return None if value is None else self._codes[self.enum_class(value)]
+    
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else self._members[value]
+
+class UTCDateTime(TypeDecorator):
+    """Timezone-aware UTC datetimes on every backend
+    
+    Postgres keeps them in TIMESTAMP WITH TIME ZONE. SQLite has no zone support, so the UTC wall
+    time is stored and gets tagged as UTC again when read back. Naive input is taken to be UTC.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+        return value.replace(tzinfo=None) if dialect.name == "sqlite" else value
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+class Base(DeclarativeBase):
+    """Declarative base for all ORM models"""
+    pass
 
 class College(Base):
     """College/Institution model"""
     __tablename__ = "colleges"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), unique=True, nullable=False)
-    code = Column(String(10), unique=True, nullable=False)  # e.g., "MIT", "STAN"
-    location = Column(String(255))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True)
+    code: Mapped[str] = mapped_column(String(10), unique=True)  # e.g., "MIT", "STAN"
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    created_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, server_default=func.now())
     
     # Relationships
-    students = relationship("Student", back_populates="college")
-    events = relationship("Event", back_populates="college")
+    students: Mapped[List["Student"]] = relationship(back_populates="college")
+    events: Mapped[List["Event"]] = relationship(back_populates="college")
 
 class Student(Base):
     """Student model"""
     __tablename__ = "students"
     
-    id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(String(50), nullable=False)  # College-specific student ID
-    email = Column(String(255), unique=True, nullable=False)
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
-    college_id = Column(Integer, ForeignKey("colleges.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    is_active = Column(Boolean, default=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    student_id: Mapped[str] = mapped_column(String(50))  # College-specific student ID
+    email: Mapped[str] = mapped_column(String(255), unique=True)
+    first_name: Mapped[str] = mapped_column(String(100))
+    last_name: Mapped[str] = mapped_column(String(100))
+    college_id: Mapped[int] = mapped_column(ForeignKey("colleges.id"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, server_default=func.now())
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
     
     # Relationships
-    college = relationship("College", back_populates="students")
-    registrations = relationship("EventRegistration", back_populates="student")
-    attendance = relationship("Attendance", back_populates="student")
-    feedback = relationship("EventFeedback", back_populates="student")
+    college: Mapped["College"] = relationship(back_populates="students")
+    registrations: Mapped[List["EventRegistration"]] = relationship(back_populates="student")
+    attendance: Mapped[List["Attendance"]] = relationship(back_populates="student")
+    feedback: Mapped[List["EventFeedback"]] = relationship(back_populates="student")
     
     # Unique constraint for student_id within college
     __table_args__ = (UniqueConstraint('student_id', 'college_id', name='unique_student_per_college'),)
@@ -54,77 +153,104 @@ class Event(Base):
     """Event model"""
     __tablename__ = "events"
     
-    id = Column(Integer, primary_key=True, index=True)
-    event_code = Column(String(50), nullable=False)  # College-specific event code
-    title = Column(String(255), nullable=False)
-    description = Column(Text)
-    event_type = Column(String(100))  # e.g., "Workshop", "Seminar", "Conference"
-    college_id = Column(Integer, ForeignKey("colleges.id"), nullable=False)
-    start_date = Column(DateTime, nullable=False)
-    end_date = Column(DateTime, nullable=False)
-    location = Column(String(255))
-    max_capacity = Column(Integer)
-    is_cancelled = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    event_code: Mapped[str] = mapped_column(String(50))  # College-specific event code
+    title: Mapped[str] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    event_type: Mapped[Optional[str]] = mapped_column(String(100))  # e.g., "Workshop", "Seminar", "Conference"
+    college_id: Mapped[int] = mapped_column(ForeignKey("colleges.id"), index=True)
+    start_date: Mapped[datetime] = mapped_column(UTCDateTime)
+    end_date: Mapped[datetime] = mapped_column(UTCDateTime)
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    max_capacity: Mapped[Optional[int]]
+    is_cancelled: Mapped[Optional[bool]] = mapped_column(default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, server_default=func.now())
     
     # Relationships
-    college = relationship("College", back_populates="events")
-    registrations = relationship("EventRegistration", back_populates="event")
-    attendance = relationship("Attendance", back_populates="event")
-    feedback = relationship("EventFeedback", back_populates="event")
+    college: Mapped["College"] = relationship(back_populates="events")
+    registrations: Mapped[List["EventRegistration"]] = relationship(back_populates="event")
+    attendance: Mapped[List["Attendance"]] = relationship(back_populates="event")
+    feedback: Mapped[List["EventFeedback"]] = relationship(back_populates="event")
     
     # Unique constraint for event_code within college
     __table_args__ = (UniqueConstraint('event_code', 'college_id', name='unique_event_per_college'),)
 
+# Partial index over active events only, matching the get_events filters.
+# Queries must use the same `is_cancelled.is_(False)` predicate for the planner to pick it;
+# report and stats filters on college_id alone use the plain index on the column.
+Index(
+    "ix_events_active_upcoming",
+    Event.college_id,
+    Event.start_date,
+    postgresql_where=Event.is_cancelled.is_(False),
+    sqlite_where=Event.is_cancelled.is_(False),
+)
+
 class EventRegistration(Base):
     """Event registration model"""
     __tablename__ = "event_registrations"
     
-    id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
-    registration_date = Column(DateTime, default=datetime.utcnow)
-    status = Column(String(20), default="registered")  # registered, cancelled, waitlisted
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id"), index=True)
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"))
+    registration_date: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, server_default=func.now())
+    status: Mapped[Optional[RegistrationStatus]] = mapped_column(EnumCode(RegistrationStatus), default=RegistrationStatus.REGISTERED)
     
     # Relationships
-    student = relationship("Student", back_populates="registrations")
-    event = relationship("Event", back_populates="registrations")
+    student: Mapped["Student"] = relationship(back_populates="registrations")
+    event: Mapped["Event"] = relationship(back_populates="registrations")
     
     # Unique constraint to prevent duplicate registrations
-    __table_args__ = (UniqueConstraint('student_id', 'event_id', name='unique_registration'),)
+    __table_args__ = (
+        UniqueConstraint('student_id', 'event_id', name='unique_registration'),
+        # Leading event_id also serves plain event_id lookups
+        Index('ix_reg_event_status', 'event_id', 'status'),
+    )
+
+# Capacity checks only count active registrations, so keep just those rows in this one
+Index(
+    "ix_reg_event_registered",
+    EventRegistration.event_id,
+    postgresql_where=EventRegistration.status == RegistrationStatus.REGISTERED,
+    sqlite_where=EventRegistration.status == RegistrationStatus.REGISTERED,
+)
 
 class Attendance(Base):
     """Attendance tracking model"""
     __tablename__ = "attendance"
     
-    id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
-    check_in_time = Column(DateTime, default=datetime.utcnow)
-    check_out_time = Column(DateTime)
-    attendance_status = Column(String(20), default="present")  # present, absent, late
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id"))
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"))
+    check_in_time: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, server_default=func.now())
+    check_out_time: Mapped[Optional[datetime]] = mapped_column(UTCDateTime)
+    attendance_status: Mapped[Optional[AttendanceStatus]] = mapped_column(EnumCode(AttendanceStatus), default=AttendanceStatus.PRESENT)
     
     # Relationships
-    student = relationship("Student", back_populates="attendance")
-    event = relationship("Event", back_populates="attendance")
+    student: Mapped["Student"] = relationship(back_populates="attendance")
+    event: Mapped["Event"] = relationship(back_populates="attendance")
     
     # Unique constraint to prevent duplicate attendance records
-    __table_args__ = (UniqueConstraint('student_id', 'event_id', name='unique_attendance'),)
+    __table_args__ = (
+        UniqueConstraint('student_id', 'event_id', name='unique_attendance'),
+        Index('ix_att_student_status', 'student_id', 'attendance_status'),
+        Index('ix_att_event_status', 'event_id', 'attendance_status'),
+    )
 
 class EventFeedback(Base):
     """Event feedback model"""
     __tablename__ = "event_feedback"
     
-    id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
-    rating = Column(Integer, nullable=False)  # 1-5 scale
-    feedback_text = Column(Text)
-    submitted_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id"), index=True)
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
+    rating: Mapped[int]  # 1-5 scale
+    feedback_text: Mapped[Optional[str]] = mapped_column(Text)
+    submitted_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, server_default=func.now())
     
     # Relationships
-    student = relationship("Student", back_populates="feedback")
-    event = relationship("Event", back_populates="feedback")
+    student: Mapped["Student"] = relationship(back_populates="feedback")
+    event: Mapped["Event"] = relationship(back_populates="feedback")
     
     # Unique constraint to prevent duplicate feedback
     __table_args__ = (UniqueConstraint('student_id', 'event_id', name='unique_feedback'),)
@@ -138,14 +264,33 @@ def get_db():
     finally:
         db.close()
 
+def get_conn():
+    """Dependency to get a bare Core connection for read-only endpoints (no Session bookkeeping)"""
+    with engine.connect() as conn:
+        yield conn
+
+def conflict_insert(model):
+    """INSERT construct for the active dialect that supports ON CONFLICT clauses"""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
 def create_tables():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
 
+def ensure_schema():
+    """Create tables only when the database has not been initialized yet"""
+    if not inspect(engine).has_table(College.__tablename__):
+        create_tables()
+
 def init_db():
-    """Initialize database with sample data"""
-    create_tables()
-    
+    """Create the schema and load sample data; run once via `python database.py`"""
+    ensure_schema()
+    seed_sample_data()
+
+def seed_sample_data():
+    """Load sample colleges, students, events and activity into an empty database"""
     db = SessionLocal()
     try:
         # Check if data already exists
@@ -153,164 +298,160 @@ def init_db():
             return
         
         # Create sample colleges
-        colleges = [
-            College(name="Massachusetts Institute of Technology", code="MIT", location="Cambridge, MA"),
-            College(name="Stanford University", code="STAN", location="Stanford, CA"),
-            College(name="University of California Berkeley", code="UCB", location="Berkeley, CA"),
-            College(name="Carnegie Mellon University", code="CMU", location="Pittsburgh, PA"),
-            College(name="Georgia Institute of Technology", code="GT", location="Atlanta, GA"),
-        ]
+        db.execute(insert(College), [
+            {"name": "Massachusetts Institute of Technology", "code": "MIT", "location": "Cambridge, MA"},
+            {"name": "Stanford University", "code": "STAN", "location": "Stanford, CA"},
+            {"name": "University of California Berkeley", "code": "UCB", "location": "Berkeley, CA"},
+            {"name": "Carnegie Mellon University", "code": "CMU", "location": "Pittsburgh, PA"},
+            {"name": "Georgia Institute of Technology", "code": "GT", "location": "Atlanta, GA"},
+        ])
         
-        for college in colleges:
-            db.add(college)
-        
-        db.commit()
+        # Look up generated college ids once instead of refreshing each row
+        college_ids = {code: college_id for college_id, code in db.query(College.id, College.code).all()}
         
         # Create sample students
-        students = [
+        db.execute(insert(Student), [
             # MIT students
-            Student(student_id="MIT001", email="john.doe@mit.edu", first_name="John", last_name="Doe", college_id=1),
-            Student(student_id="MIT002", email="jane.smith@mit.edu", first_name="Jane", last_name="Smith", college_id=1),
-            Student(student_id="MIT003", email="bob.johnson@mit.edu", first_name="Bob", last_name="Johnson", college_id=1),
-            Student(student_id="MIT004", email="sarah.wilson@mit.edu", first_name="Sarah", last_name="Wilson", college_id=1),
-            Student(student_id="MIT005", email="mike.brown@mit.edu", first_name="Mike", last_name="Brown", college_id=1),
+            {"student_id": "MIT001", "email": "john.doe@mit.edu", "first_name": "John", "last_name": "Doe", "college_id": college_ids["MIT"]},
+            {"student_id": "MIT002", "email": "jane.smith@mit.edu", "first_name": "Jane", "last_name": "Smith", "college_id": college_ids["MIT"]},
+            {"student_id": "MIT003", "email": "bob.johnson@mit.edu", "first_name": "Bob", "last_name": "Johnson", "college_id": college_ids["MIT"]},
+            {"student_id": "MIT004", "email": "sarah.wilson@mit.edu", "first_name": "Sarah", "last_name": "Wilson", "college_id": college_ids["MIT"]},
+            {"student_id": "MIT005", "email": "mike.brown@mit.edu", "first_name": "Mike", "last_name": "Brown", "college_id": college_ids["MIT"]},
             
             # Stanford students
-            Student(student_id="STAN001", email="alice.brown@stanford.edu", first_name="Alice", last_name="Brown", college_id=2),
-            Student(student_id="STAN002", email="charlie.wilson@stanford.edu", first_name="Charlie", last_name="Wilson", college_id=2),
-            Student(student_id="STAN003", email="david.garcia@stanford.edu", first_name="David", last_name="Garcia", college_id=2),
-            Student(student_id="STAN004", email="emma.davis@stanford.edu", first_name="Emma", last_name="Davis", college_id=2),
+            {"student_id": "STAN001", "email": "alice.brown@stanford.edu", "first_name": "Alice", "last_name": "Brown", "college_id": college_ids["STAN"]},
+            {"student_id": "STAN002", "email": "charlie.wilson@stanford.edu", "first_name": "Charlie", "last_name": "Wilson", "college_id": college_ids["STAN"]},
+            {"student_id": "STAN003", "email": "david.garcia@stanford.edu", "first_name": "David", "last_name": "Garcia", "college_id": college_ids["STAN"]},
+            {"student_id": "STAN004", "email": "emma.davis@stanford.edu", "first_name": "Emma", "last_name": "Davis", "college_id": college_ids["STAN"]},
             
             # UC Berkeley students
-            Student(student_id="UCB001", email="diana.davis@berkeley.edu", first_name="Diana", last_name="Davis", college_id=3),
-            Student(student_id="UCB002", email="eve.miller@berkeley.edu", first_name="Eve", last_name="Miller", college_id=3),
-            Student(student_id="UCB003", email="frank.moore@berkeley.edu", first_name="Frank", last_name="Moore", college_id=3),
-            Student(student_id="UCB004", email="grace.taylor@berkeley.edu", first_name="Grace", last_name="Taylor", college_id=3),
+            {"student_id": "UCB001", "email": "diana.davis@berkeley.edu", "first_name": "Diana", "last_name": "Davis", "college_id": college_ids["UCB"]},
+            {"student_id": "UCB002", "email": "eve.miller@berkeley.edu", "first_name": "Eve", "last_name": "Miller", "college_id": college_ids["UCB"]},
+            {"student_id": "UCB003", "email": "frank.moore@berkeley.edu", "first_name": "Frank", "last_name": "Moore", "college_id": college_ids["UCB"]},
+            {"student_id": "UCB004", "email": "grace.taylor@berkeley.edu", "first_name": "Grace", "last_name": "Taylor", "college_id": college_ids["UCB"]},
             
             # CMU students
-            Student(student_id="CMU001", email="henry.anderson@cmu.edu", first_name="Henry", last_name="Anderson", college_id=4),
-            Student(student_id="CMU002", email="iris.thomas@cmu.edu", first_name="Iris", last_name="Thomas", college_id=4),
+            {"student_id": "CMU001", "email": "henry.anderson@cmu.edu", "first_name": "Henry", "last_name": "Anderson", "college_id": college_ids["CMU"]},
+            {"student_id": "CMU002", "email": "iris.thomas@cmu.edu", "first_name": "Iris", "last_name": "Thomas", "college_id": college_ids["CMU"]},
             
             # Georgia Tech students
-            Student(student_id="GT001", email="jack.jackson@gatech.edu", first_name="Jack", last_name="Jackson", college_id=5),
-            Student(student_id="GT002", email="kate.white@gatech.edu", first_name="Kate", last_name="White", college_id=5),
-        ]
+            {"student_id": "GT001", "email": "jack.jackson@gatech.edu", "first_name": "Jack", "last_name": "Jackson", "college_id": college_ids["GT"]},
+            {"student_id": "GT002", "email": "kate.white@gatech.edu", "first_name": "Kate", "last_name": "White", "college_id": college_ids["GT"]},
+        ])
         
-        for student in students:
-            db.add(student)
-        
-        db.commit()
+        students = db.query(Student.id, Student.college_id).all()
         
         # Create sample events
-        from datetime import datetime, timedelta
-        events = [
+        from datetime import datetime, timedelta, timezone
+        now = datetime.now(timezone.utc)
+        db.execute(insert(Event), [
             # MIT Events
-            Event(
-                event_code="MIT-TECH-001",
-                title="AI and Machine Learning Workshop",
-                description="Hands-on workshop covering fundamentals of AI and ML with practical coding sessions",
-                event_type="Workshop",
-                college_id=1,
-                start_date=datetime.utcnow() + timedelta(days=7),
-                end_date=datetime.utcnow() + timedelta(days=7, hours=4),
-                location="MIT Building 32",
-                max_capacity=50
-            ),
-            Event(
-                event_code="MIT-ROBOTICS-001",
-                title="Robotics Innovation Challenge",
-                description="Build and program autonomous robots for various challenges",
-                event_type="Competition",
-                college_id=1,
-                start_date=datetime.utcnow() + timedelta(days=15),
-                end_date=datetime.utcnow() + timedelta(days=15, hours=8),
-                location="MIT Robotics Lab",
-                max_capacity=30
-            ),
+            {
+                "event_code": "MIT-TECH-001",
+                "title": "AI and Machine Learning Workshop",
+                "description": "Hands-on workshop covering fundamentals of AI and ML with practical coding sessions",
+                "event_type": "Workshop",
+                "college_id": college_ids["MIT"],
+                "start_date": now + timedelta(days=7),
+                "end_date": now + timedelta(days=7, hours=4),
+                "location": "MIT Building 32",
+                "max_capacity": 50
+            },
+            {
+                "event_code": "MIT-ROBOTICS-001",
+                "title": "Robotics Innovation Challenge",
+                "description": "Build and program autonomous robots for various challenges",
+                "event_type": "Competition",
+                "college_id": college_ids["MIT"],
+                "start_date": now + timedelta(days=15),
+                "end_date": now + timedelta(days=15, hours=8),
+                "location": "MIT Robotics Lab",
+                "max_capacity": 30
+            },
             
             # Stanford Events
-            Event(
-                event_code="STAN-ENTREP-001",
-                title="Startup Pitch Competition",
-                description="Annual startup pitch competition for student entrepreneurs",
-                event_type="Competition",
-                college_id=2,
-                start_date=datetime.utcnow() + timedelta(days=14),
-                end_date=datetime.utcnow() + timedelta(days=14, hours=6),
-                location="Stanford Graduate School of Business",
-                max_capacity=100
-            ),
-            Event(
-                event_code="STAN-DATA-001",
-                title="Data Science Symposium",
-                description="Exploring the latest trends in data science and analytics",
-                event_type="Symposium",
-                college_id=2,
-                start_date=datetime.utcnow() + timedelta(days=25),
-                end_date=datetime.utcnow() + timedelta(days=25, hours=6),
-                location="Stanford Computer Science Building",
-                max_capacity=80
-            ),
+            {
+                "event_code": "STAN-ENTREP-001",
+                "title": "Startup Pitch Competition",
+                "description": "Annual startup pitch competition for student entrepreneurs",
+                "event_type": "Competition",
+                "college_id": college_ids["STAN"],
+                "start_date": now + timedelta(days=14),
+                "end_date": now + timedelta(days=14, hours=6),
+                "location": "Stanford Graduate School of Business",
+                "max_capacity": 100
+            },
+            {
+                "event_code": "STAN-DATA-001",
+                "title": "Data Science Symposium",
+                "description": "Exploring the latest trends in data science and analytics",
+                "event_type": "Symposium",
+                "college_id": college_ids["STAN"],
+                "start_date": now + timedelta(days=25),
+                "end_date": now + timedelta(days=25, hours=6),
+                "location": "Stanford Computer Science Building",
+                "max_capacity": 80
+            },
             
             # UC Berkeley Events
-            Event(
-                event_code="UCB-RESEARCH-001",
-                title="Research Symposium",
-                description="Graduate student research presentations across multiple disciplines",
-                event_type="Symposium",
-                college_id=3,
-                start_date=datetime.utcnow() + timedelta(days=21),
-                end_date=datetime.utcnow() + timedelta(days=21, hours=8),
-                location="UC Berkeley Campus",
-                max_capacity=200
-            ),
-            Event(
-                event_code="UCB-CYBER-001",
-                title="Cybersecurity Workshop",
-                description="Learn about cybersecurity best practices and ethical hacking",
-                event_type="Workshop",
-                college_id=3,
-                start_date=datetime.utcnow() + timedelta(days=30),
-                end_date=datetime.utcnow() + timedelta(days=30, hours=5),
-                location="UC Berkeley EECS Building",
-                max_capacity=60
-            ),
+            {
+                "event_code": "UCB-RESEARCH-001",
+                "title": "Research Symposium",
+                "description": "Graduate student research presentations across multiple disciplines",
+                "event_type": "Symposium",
+                "college_id": college_ids["UCB"],
+                "start_date": now + timedelta(days=21),
+                "end_date": now + timedelta(days=21, hours=8),
+                "location": "UC Berkeley Campus",
+                "max_capacity": 200
+            },
+            {
+                "event_code": "UCB-CYBER-001",
+                "title": "Cybersecurity Workshop",
+                "description": "Learn about cybersecurity best practices and ethical hacking",
+                "event_type": "Workshop",
+                "college_id": college_ids["UCB"],
+                "start_date": now + timedelta(days=30),
+                "end_date": now + timedelta(days=30, hours=5),
+                "location": "UC Berkeley EECS Building",
+                "max_capacity": 60
+            },
             
             # CMU Events
-            Event(
-                event_code="CMU-SOFTWARE-001",
-                title="Software Engineering Best Practices",
-                description="Industry experts share insights on modern software development",
-                event_type="Seminar",
-                college_id=4,
-                start_date=datetime.utcnow() + timedelta(days=10),
-                end_date=datetime.utcnow() + timedelta(days=10, hours=3),
-                location="CMU Gates Hillman Center",
-                max_capacity=120
-            ),
+            {
+                "event_code": "CMU-SOFTWARE-001",
+                "title": "Software Engineering Best Practices",
+                "description": "Industry experts share insights on modern software development",
+                "event_type": "Seminar",
+                "college_id": college_ids["CMU"],
+                "start_date": now + timedelta(days=10),
+                "end_date": now + timedelta(days=10, hours=3),
+                "location": "CMU Gates Hillman Center",
+                "max_capacity": 120
+            },
             
             # Georgia Tech Events
-            Event(
-                event_code="GT-GAME-001",
-                title="Game Development Workshop",
-                description="Create your own video game using modern development tools",
-                event_type="Workshop",
-                college_id=5,
-                start_date=datetime.utcnow() + timedelta(days=18),
-                end_date=datetime.utcnow() + timedelta(days=18, hours=6),
-                location="Georgia Tech College of Computing",
-                max_capacity=40
-            ),
-        ]
-        
-        for event in events:
-            db.add(event)
+            {
+                "event_code": "GT-GAME-001",
+                "title": "Game Development Workshop",
+                "description": "Create your own video game using modern development tools",
+                "event_type": "Workshop",
+                "college_id": college_ids["GT"],
+                "start_date": now + timedelta(days=18),
+                "end_date": now + timedelta(days=18, hours=6),
+                "location": "Georgia Tech College of Computing",
+                "max_capacity": 40
+            },
+        ])
         
-        db.commit()
+        events = db.query(Event.id, Event.college_id, Event.max_capacity).order_by(Event.id).all()
         
         # Create sample registrations, attendance, and feedback
         create_sample_activity_data(db, students, events)
         
+        # Everything above runs in one transaction, so seeding pays for a single commit
+        db.commit()
+        
     except Exception as e:
         db.rollback()
         raise e
@@ -318,75 +459,98 @@ def init_db():
         db.close()
 
 def create_sample_activity_data(db, students, events):
-    """Create sample registrations, attendance, and feedback data"""
-    import random
-    from datetime import datetime, timedelta
+    """Create sample registrations, attendance, and feedback data
+    
+    `students` and `events` are lightweight id rows; child rows are built as
+    plain dicts and sent as one executemany INSERT per table. All random
+    decisions for a table are drawn from NumPy in a single vectorized call.
+    The caller owns the transaction and commits once seeding is complete.
+    """
+    import numpy as np
+    from collections import defaultdict
+    from datetime import datetime, timedelta, timezone
+    
+    rng = np.random.default_rng(0)
+    now = datetime.now(timezone.utc)
+    
+    students_by_college = defaultdict(list)
+    for student in students:
+        students_by_college[student.college_id].append(student)
     
     # Sample registrations for events
     registrations = []
-    for event in events[:6]:  # Only for first 6 events
+    for seed_event in events[:6]:  # Only for first 6 events
         # Randomly select 60-80% of students from the same college
-        college_students = [s for s in students if s.college_id == event.college_id]
-        num_registrations = random.randint(
-            max(1, len(college_students) // 2), 
-            min(len(college_students), event.max_capacity or len(college_students))
-        )
+        college_students = students_by_college[seed_event.college_id]
+        num_registrations = int(rng.integers(
+            max(1, len(college_students) // 2),
+            min(len(college_students), seed_event.max_capacity or len(college_students)),
+            endpoint=True
+        ))
         
-        selected_students = random.sample(college_students, num_registrations)
+        selected = rng.choice(len(college_students), size=num_registrations, replace=False)
+        days_ago = rng.integers(1, 30, size=num_registrations, endpoint=True)
         
-        for student in selected_students:
-            registration = EventRegistration(
-                student_id=student.id,
-                event_id=event.id,
-                registration_date=datetime.utcnow() - timedelta(days=random.randint(1, 30)),
-                status="registered"
-            )
-            registrations.append(registration)
-            db.add(registration)
-    
-    db.commit()
-    
-    # Sample attendance (80-95% of registrations)
-    attendance_records = []
-    for registration in registrations:
-        if random.random() < 0.85:  # 85% attendance rate
-            attendance = Attendance(
-                student_id=registration.student_id,
-                event_id=registration.event_id,
-                check_in_time=datetime.utcnow() - timedelta(days=random.randint(1, 20)),
-                attendance_status="present" if random.random() > 0.1 else "late"
-            )
-            attendance_records.append(attendance)
-            db.add(attendance)
-    
-    db.commit()
-    
-    # Sample feedback (70-90% of attendance)
-    feedback_records = []
-    for attendance in attendance_records:
-        if random.random() < 0.8:  # 80% feedback rate
-            feedback = EventFeedback(
-                student_id=attendance.student_id,
-                event_id=attendance.event_id,
-                rating=random.randint(3, 5),  # Mostly positive ratings
-                feedback_text=random.choice([
-                    "Great event! Very informative and well-organized.",
-                    "Excellent speakers and engaging content.",
-                    "Learned a lot from this workshop.",
-                    "Well-structured event with practical examples.",
-                    "Good networking opportunities.",
-                    "Could use more hands-on activities.",
-                    "Very professional and educational.",
-                    "Amazing experience, would recommend!",
-                    "Good content but room was too crowded.",
-                    "Inspiring and thought-provoking presentations."
-                ]),
-                submitted_at=datetime.utcnow() - timedelta(days=random.randint(1, 15))
-            )
-            feedback_records.append(feedback)
-            db.add(feedback)
-    
-    db.commit()
+        for index, days in zip(selected.tolist(), days_ago.tolist()):
+            registrations.append({
+                "student_id": college_students[index].id,
+                "event_id": seed_event.id,
+                "registration_date": now - timedelta(days=days),
+                "status": RegistrationStatus.REGISTERED
+            })
+    
+    db.execute(insert(EventRegistration), registrations)
+    
+    # Sample attendance (85% of registrations, 10% of those late)
+    attended = [r for r, hit in zip(registrations, rng.random(len(registrations)) < 0.85) if hit]
+    statuses = [
+        AttendanceStatus.PRESENT if on_time else AttendanceStatus.LATE
+        for on_time in (rng.random(len(attended)) > 0.1).tolist()
+    ]
+    check_in_days = rng.integers(1, 20, size=len(attended), endpoint=True).tolist()
+    
+    attendance_records = [
+        {
+            "student_id": registration["student_id"],
+            "event_id": registration["event_id"],
+            "check_in_time": now - timedelta(days=days),
+            "attendance_status": attendance_status
+        }
+        for registration, attendance_status, days in zip(attended, statuses, check_in_days)
+    ]
+    
+    db.execute(insert(Attendance), attendance_records)
+    
+    # Sample feedback (80% of attendance)
+    feedback_texts = [
+        "Great event! Very informative and well-organized.",
+        "Excellent speakers and engaging content.",
+        "Learned a lot from this workshop.",
+        "Well-structured event with practical examples.",
+        "Good networking opportunities.",
+        "Could use more hands-on activities.",
+        "Very professional and educational.",
+        "Amazing experience, would recommend!",
+        "Good content but room was too crowded.",
+        "Inspiring and thought-provoking presentations."
+    ]
+    reviewed = [a for a, hit in zip(attendance_records, rng.random(len(attendance_records)) < 0.8) if hit]
+    ratings = rng.integers(3, 5, size=len(reviewed), endpoint=True).tolist()  # Mostly positive ratings
+    text_indexes = rng.integers(0, len(feedback_texts), size=len(reviewed)).tolist()
+    submitted_days = rng.integers(1, 15, size=len(reviewed), endpoint=True).tolist()
+    
+    feedback_records = [
+        {
+            "student_id": attendance["student_id"],
+            "event_id": attendance["event_id"],
+            "rating": rating,
+            "feedback_text": feedback_texts[text_index],
+            "submitted_at": now - timedelta(days=days)
+        }
+        for attendance, rating, text_index, days in zip(reviewed, ratings, text_indexes, submitted_days)
+    ]
+    
+    db.execute(insert(EventFeedback), feedback_records)
 
 if __name__ == "__main__":
     init_db()
@@ -1,23 +1,33 @@
 """
 FastAPI application for Event Reporting System
 """
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from datetime import datetime, timedelta, timezone
+import hashlib
+import orjson
 import uvicorn
 
-from database import get_db, init_db
+import database as orm
+from database import SessionLocal, get_db, get_conn, ensure_schema
 from models import *
-from services import EventService, StudentService, ReportService
+from services import EventService, StudentService, ReportService, invalidate_event_stats, invalidate_college_stats
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Event Reporting System",
     description="Comprehensive event management and reporting platform for campus events",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -27,313 +37,442 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-After"],
 )
 
+# Compress JSON list and report bodies; tiny responses are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize database on startup
+# Create the schema on startup; sample data is loaded separately with `python database.py`
 @app.on_event("startup")
-async def startup_event():
-    init_db()
+def startup_event():
+    ensure_schema()
+
+def fetch_rows(conn: Connection, model, *criteria):
+    """Fetch plain column mappings for read-only endpoints, skipping ORM instance hydration"""
+    stmt = select(*model.__table__.columns).where(*criteria)
+    return conn.execute(stmt).mappings().all()
+
+def insert_for_college(db: Session, stmt):
+    """Run a conflict-guarded INSERT ... RETURNING for a row that belongs to a college
+    
+    Duplicates come back as None; an unknown college_id is rejected by the foreign key as a 404.
+    """
+    try:
+        return db.execute(stmt).mappings().first()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="College not found"
+        )
 
-# Root endpoint to serve the main page
+def keyset_page(conn: Connection, model, criteria, after_id: Optional[int], skip: int, limit: int):
+    """Fetch one page ordered by id; `after_id` seeks past the previous page instead of using OFFSET
+    
+    Returns the rows and the id to pass as `after_id` for the next page (None on the last page).
+    """
+    stmt = select(*model.__table__.columns).where(*criteria).order_by(model.id).limit(limit)
+    if after_id is not None:
+        stmt = stmt.where(model.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    
+    rows = conn.execute(stmt).mappings().all()
+    next_after = rows[-1]["id"] if rows and len(rows) == limit else None
+    return rows, next_after
+
+def count_rows(conn: Connection, model, criteria):
+    """Count the rows matching `criteria`, for list endpoints asked to `include_total`"""
+    stmt = select(func.count()).select_from(model).where(*criteria)
+    return conn.execute(stmt).scalar_one()
+
+def page_envelope(item_model, rows, total: int, skip: int, limit: int):
+    """Wrap one page of rows with the total count; `page` is derived from `skip`"""
+    return PaginatedResponse[item_model](
+        items=rows,
+        total=total,
+        page=skip // limit + 1 if limit else 1,
+        size=limit,
+        pages=-(-total // limit) if limit else 0
+    )
+
+def etag_response(request: Request, content, cache_control: str, headers: Optional[dict] = None):
+    """JSON response tagged with an ETag of its body; returns 304 if the client already has it"""
+    body = orjson.dumps(jsonable_encoder(content))
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": cache_control}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Write UTC datetimes as "...Z", the way Pydantic serializes them for the other endpoints
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+def report_response(content):
+    """Serialize report DTOs the services already built straight to JSON with orjson
+    
+    Returning a Response skips FastAPI re-validating them against `response_model` and walking
+    them through jsonable_encoder; `response_model` stays on the route for the OpenAPI schema.
+    """
+    return Response(content=orjson.dumps(content, option=ORJSON_OPTIONS), media_type="application/json")
+
+def stream_json_array(items):
+    """Encode items one at a time into a JSON array, so the body streams out as rows are read"""
+    yield b"["
+    for index, item in enumerate(items):
+        yield (b"," if index else b"") + orjson.dumps(item, option=ORJSON_OPTIONS)
+    yield b"]"
+
+# Root endpoint to serve the main page; HEAD lets liveness probes skip the file body
 @app.get("/")
-async def read_root():
+@app.head("/", include_in_schema=False)
+async def read_root(request: Request):
     from fastapi.responses import FileResponse
-    return FileResponse('static/index.html')
+    return FileResponse('static/index.html', method=request.method)
 
-# Health check endpoint
+# Health check endpoint (HEAD for probes that only need the status code)
 @app.get("/health")
+@app.head("/health", include_in_schema=False)
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow()}
+    return {"status": "healthy", "timestamp": datetime.now(timezone.utc)}
 
 # College endpoints
 @app.get("/colleges", response_model=List[College])
-async def get_colleges(db: Session = Depends(get_db)):
+def get_colleges(request: Request, conn: Connection = Depends(get_conn)):
     """Get all colleges"""
-    return db.query(College).all()
+    # Colleges rarely change, so clients may reuse the list for a minute
+    colleges = [College.model_validate(college) for college in fetch_rows(conn, orm.College)]
+    return etag_response(request, colleges, "public, max-age=60")
 
 @app.post("/colleges", response_model=College)
-async def create_college(college: CollegeCreate, db: Session = Depends(get_db)):
+def create_college(college: CollegeCreate, db: Session = Depends(get_db)):
     """Create a new college"""
-    # Check if college code already exists
-    existing = db.query(College).filter(College.code == college.code).first()
-    if existing:
+    # Insert unless either unique constraint (code, name) is hit, in the same statement
+    stmt = orm.conflict_insert(orm.College).values(**college.model_dump()).on_conflict_do_nothing().returning(
+        *orm.College.__table__.columns
+    )
+    db_college = db.execute(stmt).mappings().first()
+    if db_college is None:
+        # Only the conflict path pays for working out which constraint failed
+        existing = db.query(orm.College.id).filter(orm.College.code == college.code).first()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="College code already exists"
+            detail="College code already exists" if existing else "College name already exists"
         )
     
-    db_college = College(**college.dict())
-    db.add(db_college)
     db.commit()
-    db.refresh(db_college)
     return db_college
 
 # Student endpoints
-@app.get("/students", response_model=List[Student])
-async def get_students(
+@app.get("/students", response_model=Union[List[Student], PaginatedResponse[Student]])
+def get_students(
+    response: Response,
     college_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = None,
+    include_total: bool = False,
+    conn: Connection = Depends(get_conn)
 ):
-    """Get students with optional college filter"""
-    query = db.query(Student)
+    """Get students with optional college filter
+    
+    Pass the `X-Next-After` header of one page as `after_id` to fetch the next one.
+    With `include_total` the page comes wrapped as {"items", "total", "page", "size", "pages"}.
+    """
+    criteria = []
     if college_id:
-        query = query.filter(Student.college_id == college_id)
+        criteria.append(orm.Student.college_id == college_id)
     
-    return query.offset(skip).limit(limit).all()
+    students, next_after = keyset_page(conn, orm.Student, criteria, after_id, skip, limit)
+    if next_after is not None:
+        response.headers["X-Next-After"] = str(next_after)
+    if include_total:
+        return page_envelope(Student, students, count_rows(conn, orm.Student, criteria), skip, limit)
+    return students
 
 @app.post("/students", response_model=Student)
-async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
+def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     """Create a new student"""
-    # Check if student ID already exists in the college
-    existing = db.query(Student).filter(
-        Student.student_id == student.student_id,
-        Student.college_id == student.college_id
-    ).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Student ID already exists in this college"
-        )
-    
-    # Check if email already exists
-    existing_email = db.query(Student).filter(Student.email == student.email).first()
-    if existing_email:
+    # Insert unless either unique constraint (student ID per college, email) is hit
+    stmt = orm.conflict_insert(orm.Student).values(**student.model_dump()).on_conflict_do_nothing().returning(
+        *orm.Student.__table__.columns
+    )
+    db_student = insert_for_college(db, stmt)
+    if db_student is None:
+        # Only the conflict path pays for working out which constraint failed
+        existing = db.query(orm.Student.id).filter(
+            orm.Student.student_id == student.student_id,
+            orm.Student.college_id == student.college_id
+        ).first()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already exists"
+            detail="Student ID already exists in this college" if existing else "Email already exists"
         )
     
-    db_student = Student(**student.dict())
-    db.add(db_student)
     db.commit()
-    db.refresh(db_student)
+    invalidate_college_stats()
     return db_student
 
 # Event endpoints
-@app.get("/events", response_model=List[Event])
-async def get_events(
+@app.get("/events", response_model=Union[List[Event], PaginatedResponse[Event]])
+def get_events(
+    request: Request,
     college_id: Optional[int] = None,
     event_type: Optional[EventType] = None,
     upcoming_only: bool = True,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = None,
+    include_total: bool = False,
+    conn: Connection = Depends(get_conn)
 ):
-    """Get events with optional filters"""
-    query = db.query(Event)
+    """Get events with optional filters
+    
+    Pass the `X-Next-After` header of one page as `after_id` to fetch the next one.
+    With `include_total` the page comes wrapped as {"items", "total", "page", "size", "pages"}.
+    """
+    now = datetime.now(timezone.utc)
+    criteria = []
     
     if college_id:
-        query = query.filter(Event.college_id == college_id)
+        criteria.append(orm.Event.college_id == college_id)
     
     if event_type:
-        query = query.filter(Event.event_type == event_type)
+        criteria.append(orm.Event.event_type == event_type)
     
     if upcoming_only:
-        query = query.filter(Event.start_date > datetime.utcnow())
+        criteria.append(orm.Event.start_date > now)
+    
+    criteria.append(orm.Event.is_cancelled.is_(False))
     
-    query = query.filter(Event.is_cancelled == False)
+    rows, next_after = keyset_page(conn, orm.Event, criteria, after_id, skip, limit)
+    headers = {"X-Next-After": str(next_after)} if next_after is not None else None
     
-    return query.offset(skip).limit(limit).all()
+    # Events can be edited, so clients must revalidate; unchanged lists come back as 304
+    events = [Event.model_validate(event) for event in rows]
+    if include_total:
+        events = page_envelope(Event, events, count_rows(conn, orm.Event, criteria), skip, limit)
+    return etag_response(request, events, "no-cache", headers)
 
 @app.post("/events", response_model=Event)
-async def create_event(event: EventCreate, db: Session = Depends(get_db)):
+def create_event(event: EventCreate, db: Session = Depends(get_db)):
     """Create a new event"""
-    # Check if event code already exists in the college
-    existing = db.query(Event).filter(
-        Event.event_code == event.event_code,
-        Event.college_id == event.college_id
-    ).first()
-    if existing:
+    # Validate dates
+    if event.start_date >= event.end_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Event code already exists in this college"
+            detail="Start date must be before end date"
         )
     
-    # Validate dates
-    if event.start_date >= event.end_date:
+    # Let the unique constraint on event code within the college reject duplicates
+    stmt = orm.conflict_insert(orm.Event).values(**event.model_dump()).on_conflict_do_nothing(
+        index_elements=["event_code", "college_id"]
+    ).returning(*orm.Event.__table__.columns)
+    db_event = insert_for_college(db, stmt)
+    if db_event is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Start date must be before end date"
+            detail="Event code already exists in this college"
         )
     
-    db_event = Event(**event.dict())
-    db.add(db_event)
     db.commit()
-    db.refresh(db_event)
+    invalidate_college_stats()
     return db_event
 
 @app.put("/events/{event_id}", response_model=Event)
-async def update_event(
+def update_event(
     event_id: int,
     event_update: EventUpdate,
     db: Session = Depends(get_db)
 ):
     """Update an event"""
-    db_event = db.query(Event).filter(Event.id == event_id).first()
+    db_event = db.get(orm.Event, event_id)
     if not db_event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
-    update_data = event_update.dict(exclude_unset=True)
+    update_data = event_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_event, field, value)
     
     db.commit()
+    invalidate_event_stats(event_id)
     db.refresh(db_event)
     return db_event
 
 # Registration endpoints
 @app.post("/registrations", response_model=EventRegistration)
-async def register_for_event(
+def register_for_event(
     registration: EventRegistrationCreate,
     db: Session = Depends(get_db)
 ):
     """Register a student for an event"""
-    return await EventService.register_student(db, registration)
+    return EventService.register_student(db, registration)
 
 @app.delete("/registrations/{registration_id}")
-async def cancel_registration(
+def cancel_registration(
     registration_id: int,
     db: Session = Depends(get_db)
 ):
     """Cancel a registration"""
-    return await EventService.cancel_registration(db, registration_id)
+    return EventService.cancel_registration(db, registration_id)
 
 @app.get("/registrations/event/{event_id}", response_model=List[EventRegistration])
-async def get_event_registrations(
+def get_event_registrations(
     event_id: int,
-    db: Session = Depends(get_db)
+    conn: Connection = Depends(get_conn)
 ):
     """Get all registrations for an event"""
-    return db.query(EventRegistration).filter(
-        EventRegistration.event_id == event_id
-    ).all()
+    return fetch_rows(conn, orm.EventRegistration, orm.EventRegistration.event_id == event_id)
 
 @app.get("/registrations/student/{student_id}", response_model=List[EventRegistration])
-async def get_student_registrations(
+def get_student_registrations(
     student_id: int,
-    db: Session = Depends(get_db)
+    conn: Connection = Depends(get_conn)
 ):
     """Get all registrations for a student"""
-    return db.query(EventRegistration).filter(
-        EventRegistration.student_id == student_id
-    ).all()
+    return fetch_rows(conn, orm.EventRegistration, orm.EventRegistration.student_id == student_id)
 
 # Attendance endpoints
 @app.post("/attendance", response_model=Attendance)
-async def mark_attendance(
+def mark_attendance(
     attendance: AttendanceCreate,
     db: Session = Depends(get_db)
 ):
     """Mark student attendance for an event"""
-    return await EventService.mark_attendance(db, attendance)
+    return EventService.mark_attendance(db, attendance)
 
 @app.get("/attendance/event/{event_id}", response_model=List[Attendance])
-async def get_event_attendance(
+def get_event_attendance(
     event_id: int,
-    db: Session = Depends(get_db)
+    conn: Connection = Depends(get_conn)
 ):
     """Get attendance records for an event"""
-    return db.query(Attendance).filter(Attendance.event_id == event_id).all()
+    return fetch_rows(conn, orm.Attendance, orm.Attendance.event_id == event_id)
 
 @app.get("/attendance/student/{student_id}", response_model=List[Attendance])
-async def get_student_attendance(
+def get_student_attendance(
     student_id: int,
-    db: Session = Depends(get_db)
+    conn: Connection = Depends(get_conn)
 ):
     """Get attendance records for a student"""
-    return db.query(Attendance).filter(Attendance.student_id == student_id).all()
+    return fetch_rows(conn, orm.Attendance, orm.Attendance.student_id == student_id)
 
 # Feedback endpoints
 @app.post("/feedback", response_model=EventFeedback)
-async def submit_feedback(
+def submit_feedback(
     feedback: EventFeedbackCreate,
     db: Session = Depends(get_db)
 ):
     """Submit feedback for an event"""
-    return await EventService.submit_feedback(db, feedback)
+    return EventService.submit_feedback(db, feedback)
 
 @app.get("/feedback/event/{event_id}", response_model=List[EventFeedback])
-async def get_event_feedback(
+def get_event_feedback(
     event_id: int,
-    db: Session = Depends(get_db)
+    conn: Connection = Depends(get_conn)
 ):
     """Get all feedback for an event"""
-    return db.query(EventFeedback).filter(EventFeedback.event_id == event_id).all()
+    return fetch_rows(conn, orm.EventFeedback, orm.EventFeedback.event_id == event_id)
 
 @app.get("/feedback/student/{student_id}", response_model=List[EventFeedback])
-async def get_student_feedback(
+def get_student_feedback(
     student_id: int,
-    db: Session = Depends(get_db)
+    conn: Connection = Depends(get_conn)
 ):
     """Get all feedback submitted by a student"""
-    return db.query(EventFeedback).filter(EventFeedback.student_id == student_id).all()
+    return fetch_rows(conn, orm.EventFeedback, orm.EventFeedback.student_id == student_id)
 
 # Reporting endpoints
 @app.get("/reports/event-stats/{event_id}", response_model=EventStats)
-async def get_event_stats(
+def get_event_stats(
     event_id: int,
     db: Session = Depends(get_db)
 ):
     """Get comprehensive statistics for an event"""
-    return await ReportService.get_event_stats(db, event_id)
+    return report_response(ReportService.get_event_stats(db, event_id))
 
 @app.get("/reports/student-stats/{student_id}", response_model=StudentStats)
-async def get_student_stats(
+def get_student_stats(
     student_id: int,
     db: Session = Depends(get_db)
 ):
     """Get comprehensive statistics for a student"""
-    return await ReportService.get_student_stats(db, student_id)
+    return report_response(ReportService.get_student_stats(db, student_id))
 
 @app.get("/reports/college-stats/{college_id}", response_model=CollegeStats)
-async def get_college_stats(
+def get_college_stats(
     college_id: int,
     db: Session = Depends(get_db)
 ):
     """Get comprehensive statistics for a college"""
-    return await ReportService.get_college_stats(db, college_id)
+    return report_response(ReportService.get_college_stats(db, college_id))
 
 @app.get("/reports/event-participation", response_model=List[EventParticipationReport])
-async def get_event_participation_report(
+def get_event_participation_report(
     college_id: Optional[int] = None,
     event_type: Optional[EventType] = None,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    end_date: Optional[datetime] = None
 ):
     """Get comprehensive event participation report"""
-    return await ReportService.get_event_participation_report(
-        db, college_id, event_type, start_date, end_date
-    )
+    def rows():
+        # Rows are read while the body streams, after this handler has returned, so the
+        # generator owns its session instead of relying on when get_db is torn down
+        db = SessionLocal()
+        try:
+            yield from ReportService.get_event_participation_report(
+                db, college_id, event_type, start_date, end_date
+            )
+        finally:
+            db.close()
+    
+    return StreamingResponse(stream_json_array(rows()), media_type="application/json")
 
 @app.get("/reports/top-students", response_model=List[TopStudentsReport])
-async def get_top_students_report(
+def get_top_students_report(
     college_id: Optional[int] = None,
     limit: int = 10,
     db: Session = Depends(get_db)
 ):
     """Get top most active students"""
-    return await ReportService.get_top_students_report(db, college_id, limit)
+    return report_response(ReportService.get_top_students_report(db, college_id, limit))
 
 @app.get("/reports/event-popularity", response_model=List[EventStats])
-async def get_event_popularity_report(
+def get_event_popularity_report(
     college_id: Optional[int] = None,
     event_type: Optional[EventType] = None,
     limit: int = 10,
     db: Session = Depends(get_db)
 ):
     """Get event popularity ranking"""
-    return await ReportService.get_event_popularity_report(
+    report = ReportService.get_event_popularity_report(
         db, college_id, event_type, limit
     )
+    return report_response(report)
+
+@app.get("/reports/summary", response_model=ReportSummary)
+def get_report_summary(
+    college_id: Optional[int] = None,
+    pop_limit: int = 5,
+    student_limit: int = 5,
+    db: Session = Depends(get_db)
+):
+    """Get the event popularity ranking and the top students in one call"""
+    summary = ReportSummary(
+        popularity=ReportService.get_event_popularity_report(db, college_id, None, pop_limit),
+        top_students=ReportService.get_top_students_report(db, college_id, student_limit)
+    )
+    return report_response(summary)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,10 +1,17 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
-from datetime import datetime
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, field_validator
+from typing import Annotated, Generic, Optional, List, TypeVar
+from datetime import datetime, timezone
 from enum import Enum
+from dataclasses import dataclass
+
+def _as_utc(value: datetime) -> datetime:
+    """Read naive datetimes as UTC and convert aware ones to UTC, the way they are stored"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+UTCDatetime = Annotated[datetime, AfterValidator(_as_utc)]
 
 class EventType(str, Enum):
     WORKSHOP = "Workshop"
@@ -39,8 +46,7 @@ class College(CollegeBase):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Student Models
 class StudentBase(BaseModel):
@@ -58,8 +64,7 @@ class Student(StudentBase):
     created_at: datetime
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Event Models
 class EventBase(BaseModel):
@@ -68,8 +73,8 @@ class EventBase(BaseModel):
     description: Optional[str] = None
     event_type: Optional[EventType] = None
     college_id: int
-    start_date: datetime
-    end_date: datetime
+    start_date: UTCDatetime
+    end_date: UTCDatetime
     location: Optional[str] = None
     max_capacity: Optional[int] = None
 
@@ -80,8 +85,8 @@ class EventUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     event_type: Optional[EventType] = None
-    start_date: Optional[datetime] = None
-    end_date: Optional[datetime] = None
+    start_date: Optional[UTCDatetime] = None
+    end_date: Optional[UTCDatetime] = None
     location: Optional[str] = None
     max_capacity: Optional[int] = None
     is_cancelled: Optional[bool] = None
@@ -91,8 +96,7 @@ class Event(EventBase):
     is_cancelled: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Registration Models
 class EventRegistrationBase(BaseModel):
@@ -107,15 +111,14 @@ class EventRegistration(EventRegistrationBase):
     id: int
     registration_date: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Attendance Models
 class AttendanceBase(BaseModel):
     student_id: int
     event_id: int
     attendance_status: AttendanceStatus = AttendanceStatus.PRESENT
-    check_out_time: Optional[datetime] = None
+    check_out_time: Optional[UTCDatetime] = None
 
 class AttendanceCreate(AttendanceBase):
     pass
@@ -124,8 +127,7 @@ class Attendance(AttendanceBase):
     id: int
     check_in_time: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Feedback Models
 class EventFeedbackBase(BaseModel):
@@ -135,7 +137,8 @@ class EventFeedbackBase(BaseModel):
     feedback_text: Optional[str] = None
 
 class EventFeedbackCreate(EventFeedbackBase):
-    @validator('rating')
+    @field_validator('rating')
+    @classmethod
     def validate_rating(cls, v):
         if v < 1 or v > 5:
             raise ValueError('Rating must be between 1 and 5')
@@ -145,11 +148,12 @@ class EventFeedback(EventFeedbackBase):
     id: int
     submitted_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Reporting Models
-class EventStats(BaseModel):
+# Output-only, built by the report services: slotted dataclasses that orjson encodes natively
+@dataclass(slots=True, kw_only=True)
+class EventStats:
     event_id: int
     event_title: str
     total_registrations: int
@@ -158,7 +162,8 @@ class EventStats(BaseModel):
     average_rating: Optional[float] = None
     total_feedback: int
 
-class StudentStats(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class StudentStats:
     student_id: int
     student_name: str
     college_name: str
@@ -167,7 +172,8 @@ class StudentStats(BaseModel):
     attendance_rate: float
     average_rating_given: Optional[float] = None
 
-class CollegeStats(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class CollegeStats:
     college_id: int
     college_name: str
     total_students: int
@@ -176,7 +182,8 @@ class CollegeStats(BaseModel):
     average_attendance_rate: float
     average_event_rating: Optional[float] = None
 
-class EventParticipationReport(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EventParticipationReport:
     event_id: int
     event_title: str
     event_type: str
@@ -189,7 +196,8 @@ class EventParticipationReport(BaseModel):
     feedback_count: int
     capacity_utilization: Optional[float] = None
 
-class TopStudentsReport(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TopStudentsReport:
     student_id: int
     student_name: str
     college_name: str
@@ -197,13 +205,20 @@ class TopStudentsReport(BaseModel):
     total_events_attended: int
     average_rating_given: Optional[float] = None
 
+@dataclass(slots=True, kw_only=True)
+class ReportSummary:
+    popularity: List[EventStats]
+    top_students: List[TopStudentsReport]
+
 # Response Models
 class MessageResponse(BaseModel):
     message: str
     success: bool = True
 
-class PaginatedResponse(BaseModel):
-    items: List[dict]
+T = TypeVar("T")
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
     total: int
     page: int
     size: int
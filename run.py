@@ -11,30 +11,30 @@ import os
 def main():
     """Main function to start the application"""
     print("🚀 Starting Event Reporting System...")
-    print("📊 Campus Event Management Platform")
-    print("=" * 50)
     
     # Check if we're in the right directory
     if not os.path.exists("main.py"):
         print("❌ Error: main.py not found. Please run this script from the project root directory.")
         sys.exit(1)
     
-    # Check if requirements are installed
-    try:
-        import fastapi
-        import sqlalchemy
-        print("✅ Dependencies check passed")
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("Please run: pip install -r requirements.txt")
-        sys.exit(1)
+    # Check if requirements are installed (--skip-checks skips the imports, e.g. for quick restarts)
+    if "--skip-checks" not in sys.argv:
+        try:
+            import fastapi
+            import sqlalchemy
+        except ImportError as e:
+            print(f"❌ Missing dependency: {e}")
+            print("Please run: pip install -r requirements.txt")
+            sys.exit(1)
     
-    print("\n🌐 Starting server...")
-    print("📍 Web Interface: http://localhost:8000")
-    print("📚 API Documentation: http://localhost:8000/docs")
-    print("❤️  Health Check: http://localhost:8000/health")
-    print("\n💡 Press Ctrl+C to stop the server")
-    print("=" * 50)
+    rule = "=" * 50
+    print(
+        f"📊 Campus Event Management Platform\n{rule}\n"
+        f"🌐 Web Interface: http://localhost:8000\n"
+        f"📚 API Documentation: http://localhost:8000/docs\n"
+        f"❤️  Health Check: http://localhost:8000/health\n"
+        f"💡 Press Ctrl+C to stop the server\n{rule}"
+    )
     
     try:
         # Start the server
@@ -43,6 +43,8 @@ def main():
             host="0.0.0.0",
             port=8000,
             reload=True,  # Auto-reload on code changes
+            reload_dirs=["."],
+            reload_includes=["*.py"],  # ignore writes to the SQLite database and static files
             log_level="info"
         )
     except KeyboardInterrupt:
@@ -1,217 +1,290 @@
 """
 Service layer for business logic and data processing
 """
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from typing import List, Optional
-from datetime import datetime, timedelta
+from sqlalchemy import func, desc, and_, or_, select, insert, case, literal, exists
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+import threading
 from models import *
 from database import Event, Student, College, EventRegistration, Attendance, EventFeedback
 
+# Error details returned by the service layer
+STUDENT_NOT_FOUND = "Student not found"
+EVENT_NOT_FOUND = "Event not found"
+COLLEGE_NOT_FOUND = "College not found"
+REGISTRATION_NOT_FOUND = "Registration not found"
+STUDENT_OR_EVENT_NOT_FOUND = "Student or event not found"
+EVENT_CANCELLED = "Cannot register for cancelled event"
+EVENT_ALREADY_STARTED = "Cannot register for event that has already started"
+ALREADY_REGISTERED = "Student is already registered for this event"
+ALREADY_CANCELLED = "Registration is already cancelled"
+NOT_REGISTERED = "Student is not registered for this event"
+ATTENDANCE_REQUIRED = "Student must attend the event to submit feedback"
+ATTENDANCE_ALREADY_MARKED = "Attendance already marked for this student"
+FEEDBACK_ALREADY_SUBMITTED = "Feedback already submitted for this event"
+
+# Report label per stored event type; NULL (and anything outside EventType) reads as "Other"
+_EVENT_TYPE_LABELS = {event_type.value: event_type.value for event_type in EventType}
+
+def _not_found(detail: str) -> HTTPException:
+    """404 for a missing entity; built per raise, as a shared instance would pin its last traceback"""
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+def _bad_request(detail: str) -> HTTPException:
+    """400 for a request that breaks a business rule"""
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+def _subquery(aggregate, *criteria, join=None):
+    """Correlated scalar subquery computing one aggregate inside a larger stats SELECT"""
+    stmt = select(aggregate)
+    if join is not None:
+        stmt = stmt.join(join)
+    return stmt.where(*criteria).scalar_subquery()
+
+def _grouped(key, *aggregates):
+    """Aggregate subquery grouped by `key`, LEFT JOINed into a report as a derived table
+    
+    Joining each child table pre-aggregated avoids the row fan-out of joining them all at once,
+    which would inflate counts and skew averages.
+    """
+    return select(key.label('key'), *aggregates).group_by(key).subquery()
+
+def _get_event_for_student(db: Session, student_id: int, event_id: int, for_update: bool = False):
+    """Load an event and check the student exists in one round-trip, raising 404 for whichever is missing
+    
+    A missing student is reported first, the order the checks were originally made in.
+    """
+    stmt = select(Event, exists().where(Student.id == student_id)).where(Event.id == event_id)
+    if for_update:
+        stmt = stmt.with_for_update(of=Event)
+    
+    row = db.execute(stmt).first()
+    if row is None:
+        # Event is missing; only now look up whether the student is too
+        event, student_exists = None, db.scalar(select(exists().where(Student.id == student_id)))
+    else:
+        event, student_exists = row
+    
+    if not student_exists:
+        raise _not_found(STUDENT_NOT_FOUND)
+    
+    if event is None:
+        raise _not_found(EVENT_NOT_FOUND)
+    
+    return event
+
+def _insert_rejected(error: IntegrityError, duplicate_detail: str):
+    """HTTP error for an INSERT the database rejected in place of a pre-check SELECT"""
+    if "foreign key" in str(error.orig).lower():
+        return _not_found(STUDENT_OR_EVENT_NOT_FOUND)
+    
+    return _bad_request(duplicate_detail)
+
+class _StatsCache:
+    """Bounded LRU of computed stats keyed by (kind, id, write generation)
+    
+    Writes bump the generation rather than deleting entries, so stale results are simply
+    never looked up again and age out. Entries live per process.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+_stats_cache = _StatsCache()
+_event_generation: Dict[int, int] = {}
+_college_generation = 0
+# Writes run on threadpool workers; bumps must not lose increments or go backwards
+_generation_lock = threading.Lock()
+
+def invalidate_event_stats(event_id: int):
+    """Mark cached stats for an event stale; call after the write has committed"""
+    with _generation_lock:
+        _event_generation[event_id] = _event_generation.get(event_id, 0) + 1
+    # Every event write also feeds its college's totals
+    invalidate_college_stats()
+
+def invalidate_college_stats():
+    """Mark all cached college stats stale; call after the write has committed"""
+    global _college_generation
+    with _generation_lock:
+        _college_generation += 1
+
 class EventService:
     """Service for event-related operations"""
     
     @staticmethod
-    async def register_student(db: Session, registration: EventRegistrationCreate):
-        """Register a student for an event with validation"""
-        # Check if student exists
-        student = db.query(Student).filter(Student.id == registration.student_id).first()
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
+    def register_student(db: Session, registration: EventRegistrationCreate):
+        """Register a student for an event with validation
         
-        # Check if event exists and is not cancelled
-        event = db.query(Event).filter(Event.id == registration.event_id).first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found"
-            )
-        
-        if event.is_cancelled:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot register for cancelled event"
-            )
-        
-        # Check if event has already started
-        if event.start_date <= datetime.utcnow():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot register for event that has already started"
-            )
+        Runs as one transaction holding a lock on the event row, so concurrent requests
+        cannot both take the last seat.
+        """
+        now = datetime.now(timezone.utc)
         
-        # Check if student is already registered
-        existing_registration = db.query(EventRegistration).filter(
-            EventRegistration.student_id == registration.student_id,
-            EventRegistration.event_id == registration.event_id
-        ).first()
-        
-        if existing_registration:
-            if existing_registration.status == "registered":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Student is already registered for this event"
+        with db.begin():
+            # Check if student and event exist, locking the event until commit
+            event = _get_event_for_student(db, registration.student_id, registration.event_id, for_update=True)
+            
+            # Check the event is not cancelled
+            if event.is_cancelled:
+                raise _bad_request(EVENT_CANCELLED)
+            
+            # Check if event has already started
+            if event.start_date <= now:
+                raise _bad_request(EVENT_ALREADY_STARTED)
+            
+            # Check capacity if specified; the INSERT itself picks registered or waitlisted
+            registration_status = registration.status
+            if event.max_capacity:
+                current_registrations = select(func.count(EventRegistration.id)).where(
+                    EventRegistration.event_id == registration.event_id,
+                    EventRegistration.status == RegistrationStatus.REGISTERED
+                ).scalar_subquery()
+                # CASE results are bare literals, so give them the column type to get integer-encoded
+                status_type = EventRegistration.status.type
+                registration_status = case(
+                    (current_registrations < event.max_capacity, literal(registration_status, status_type)),
+                    else_=literal(RegistrationStatus.WAITLISTED, status_type)
                 )
-            elif existing_registration.status == "cancelled":
-                # Allow re-registration if previously cancelled
-                existing_registration.status = "registered"
-                existing_registration.registration_date = datetime.utcnow()
-                db.commit()
-                db.refresh(existing_registration)
-                return existing_registration
-        
-        # Check capacity if specified
-        if event.max_capacity:
-            current_registrations = db.query(EventRegistration).filter(
-                EventRegistration.event_id == registration.event_id,
-                EventRegistration.status == "registered"
-            ).count()
             
-            if current_registrations >= event.max_capacity:
-                # Add to waitlist
-                registration.status = "waitlisted"
+            try:
+                # Savepoint, so a duplicate only undoes the INSERT and keeps the event lock
+                with db.begin_nested():
+                    db_registration = db.scalars(
+                        insert(EventRegistration).values(
+                            student_id=registration.student_id,
+                            event_id=registration.event_id,
+                            status=registration_status
+                        ).returning(EventRegistration)
+                    ).one()
+            except IntegrityError:
+                # unique_registration: the student already has a row for this event
+                db_registration = db.query(EventRegistration).filter(
+                    EventRegistration.student_id == registration.student_id,
+                    EventRegistration.event_id == registration.event_id
+                ).one()
+                
+                if db_registration.status != RegistrationStatus.CANCELLED:
+                    raise _bad_request(ALREADY_REGISTERED)
+                
+                # Allow re-registration if previously cancelled
+                db_registration.status = registration_status
+                db_registration.registration_date = now
         
-        db_registration = EventRegistration(**registration.dict())
-        db.add(db_registration)
-        db.commit()
+        invalidate_event_stats(registration.event_id)
         db.refresh(db_registration)
         return db_registration
     
     @staticmethod
-    async def cancel_registration(db: Session, registration_id: int):
-        """Cancel a registration"""
-        registration = db.query(EventRegistration).filter(
-            EventRegistration.id == registration_id
-        ).first()
-        
-        if not registration:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Registration not found"
-            )
-        
-        if registration.status == "cancelled":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Registration is already cancelled"
+    def cancel_registration(db: Session, registration_id: int):
+        """Cancel a registration, promoting the first waitlisted student in the same transaction"""
+        with db.begin():
+            registration = db.get(EventRegistration, registration_id)
+            
+            if not registration:
+                raise _not_found(REGISTRATION_NOT_FOUND)
+            
+            # Hold the event row like register_student does, so the freed seat is not raced for
+            event_id = registration.event_id
+            event = db.query(Event).filter(Event.id == event_id).with_for_update().first()
+            
+            # Re-read under the lock: a concurrent cancel of the same row may have committed
+            # while we waited, and must not promote a second waitlisted student
+            registration = db.get(
+                EventRegistration, registration_id, with_for_update=True, populate_existing=True
             )
-        
-        registration.status = "cancelled"
-        db.commit()
-        
-        # If there are waitlisted students, promote the first one
-        event = db.query(Event).filter(Event.id == registration.event_id).first()
-        if event and event.max_capacity:
-            waitlisted = db.query(EventRegistration).filter(
-                EventRegistration.event_id == registration.event_id,
-                EventRegistration.status == "waitlisted"
-            ).order_by(EventRegistration.registration_date).first()
+            if registration.status == RegistrationStatus.CANCELLED:
+                raise _bad_request(ALREADY_CANCELLED)
             
-            if waitlisted:
-                waitlisted.status = "registered"
-                db.commit()
-        
+            registration.status = RegistrationStatus.CANCELLED
+            # Flush (not commit) so the waitlist lookup below no longer sees this row as waitlisted
+            db.flush()
+            
+            # If there are waitlisted students, promote the first one
+            if event and event.max_capacity:
+                waitlisted = db.query(EventRegistration).filter(
+                    EventRegistration.event_id == event_id,
+                    EventRegistration.status == RegistrationStatus.WAITLISTED
+                ).order_by(EventRegistration.registration_date).first()
+                
+                if waitlisted:
+                    waitlisted.status = RegistrationStatus.REGISTERED
+        
+        invalidate_event_stats(event_id)
         return {"message": "Registration cancelled successfully"}
     
     @staticmethod
-    async def mark_attendance(db: Session, attendance: AttendanceCreate):
+    def mark_attendance(db: Session, attendance: AttendanceCreate):
         """Mark student attendance for an event"""
-        # Check if student exists
-        student = db.query(Student).filter(Student.id == attendance.student_id).first()
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
-        
-        # Check if event exists
-        event = db.query(Event).filter(Event.id == attendance.event_id).first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found"
-            )
-        
-        # Check if student is registered for the event
-        registration = db.query(EventRegistration).filter(
+        # Check if student is registered for the event; the registration implies both exist
+        registered = db.scalar(select(exists().where(
             EventRegistration.student_id == attendance.student_id,
             EventRegistration.event_id == attendance.event_id,
-            EventRegistration.status == "registered"
-        ).first()
+            EventRegistration.status == RegistrationStatus.REGISTERED
+        )))
         
-        if not registration:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Student is not registered for this event"
-            )
-        
-        # Check if attendance is already marked
-        existing_attendance = db.query(Attendance).filter(
-            Attendance.student_id == attendance.student_id,
-            Attendance.event_id == attendance.event_id
-        ).first()
-        
-        if existing_attendance:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Attendance already marked for this student"
-            )
+        if not registered:
+            # Report a missing student or event ahead of the missing registration
+            _get_event_for_student(db, attendance.student_id, attendance.event_id)
+            raise _bad_request(NOT_REGISTERED)
         
-        db_attendance = Attendance(**attendance.dict())
+        # unique_attendance rejects attendance that is already marked
+        db_attendance = Attendance(**attendance.model_dump())
         db.add(db_attendance)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError as error:
+            db.rollback()
+            raise _insert_rejected(error, ATTENDANCE_ALREADY_MARKED)
+        
+        invalidate_event_stats(attendance.event_id)
         db.refresh(db_attendance)
         return db_attendance
     
     @staticmethod
-    async def submit_feedback(db: Session, feedback: EventFeedbackCreate):
+    def submit_feedback(db: Session, feedback: EventFeedbackCreate):
         """Submit feedback for an event"""
-        # Check if student exists
-        student = db.query(Student).filter(Student.id == feedback.student_id).first()
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
-        
-        # Check if event exists
-        event = db.query(Event).filter(Event.id == feedback.event_id).first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found"
-            )
-        
-        # Check if student attended the event
-        attendance = db.query(Attendance).filter(
+        # Check if student attended the event; the attendance record implies both exist
+        attended = db.scalar(select(exists().where(
             Attendance.student_id == feedback.student_id,
             Attendance.event_id == feedback.event_id
-        ).first()
-        
-        if not attendance:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Student must attend the event to submit feedback"
-            )
+        )))
         
-        # Check if feedback already exists
-        existing_feedback = db.query(EventFeedback).filter(
-            EventFeedback.student_id == feedback.student_id,
-            EventFeedback.event_id == feedback.event_id
-        ).first()
+        if not attended:
+            # Report a missing student or event ahead of the missing attendance
+            _get_event_for_student(db, feedback.student_id, feedback.event_id)
+            raise _bad_request(ATTENDANCE_REQUIRED)
         
-        if existing_feedback:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Feedback already submitted for this event"
-            )
-        
-        db_feedback = EventFeedback(**feedback.dict())
+        # unique_feedback rejects a second submission
+        db_feedback = EventFeedback(**feedback.model_dump())
         db.add(db_feedback)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError as error:
+            db.rollback()
+            raise _insert_rejected(error, FEEDBACK_ALREADY_SUBMITTED)
+        
+        invalidate_event_stats(feedback.event_id)
         db.refresh(db_feedback)
         return db_feedback
 
@@ -219,26 +292,23 @@ class StudentService:
     """Service for student-related operations"""
     
     @staticmethod
-    async def get_student_participation_summary(db: Session, student_id: int):
+    def get_student_participation_summary(db: Session, student_id: int):
         """Get comprehensive participation summary for a student"""
-        student = db.query(Student).filter(Student.id == student_id).first()
+        student = db.get(Student, student_id)
         if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
+            raise _not_found(STUDENT_NOT_FOUND)
         
         # Get registration count
-        total_registrations = db.query(EventRegistration).filter(
+        total_registrations = db.execute(select(func.count(EventRegistration.id)).where(
             EventRegistration.student_id == student_id,
-            EventRegistration.status == "registered"
-        ).count()
+            EventRegistration.status == RegistrationStatus.REGISTERED
+        )).scalar_one()
         
         # Get attendance count
-        total_attendance = db.query(Attendance).filter(
+        total_attendance = db.execute(select(func.count(Attendance.id)).where(
             Attendance.student_id == student_id,
-            Attendance.attendance_status == "present"
-        ).count()
+            Attendance.attendance_status == AttendanceStatus.PRESENT
+        )).scalar_one()
         
         # Get feedback count and average rating
         feedback_stats = db.query(
@@ -259,141 +329,162 @@ class ReportService:
     """Service for generating reports and analytics"""
     
     @staticmethod
-    async def get_event_stats(db: Session, event_id: int):
+    def get_event_stats(db: Session, event_id: int):
         """Get comprehensive statistics for an event"""
-        event = db.query(Event).filter(Event.id == event_id).first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found"
-            )
-        
-        # Get registration count
-        total_registrations = db.query(EventRegistration).filter(
-            EventRegistration.event_id == event_id,
-            EventRegistration.status == "registered"
-        ).count()
-        
-        # Get attendance count
-        total_attendance = db.query(Attendance).filter(
-            Attendance.event_id == event_id,
-            Attendance.attendance_status == "present"
-        ).count()
-        
-        # Get feedback statistics
-        feedback_stats = db.query(
-            func.count(EventFeedback.id).label('count'),
-            func.avg(EventFeedback.rating).label('avg_rating')
-        ).filter(EventFeedback.event_id == event_id).first()
-        
-        attendance_percentage = (total_attendance / total_registrations * 100) if total_registrations > 0 else 0
-        
-        return EventStats(
+        # Read the generation first, so a write landing mid-query files this result as stale
+        cache_key = ("event", event_id, _event_generation.get(event_id, 0))
+        cached = _stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Every count/average is a correlated subquery, so the stats come back in one row
+        stats = db.query(
+            Event.title,
+            _subquery(func.count(EventRegistration.id),
+                      EventRegistration.event_id == Event.id,
+                      EventRegistration.status == RegistrationStatus.REGISTERED).label('registrations'),
+            _subquery(func.count(Attendance.id),
+                      Attendance.event_id == Event.id,
+                      Attendance.attendance_status == AttendanceStatus.PRESENT).label('attendance'),
+            _subquery(func.count(EventFeedback.id),
+                      EventFeedback.event_id == Event.id).label('feedback_count'),
+            _subquery(func.avg(EventFeedback.rating),
+                      EventFeedback.event_id == Event.id).label('avg_rating')
+        ).filter(Event.id == event_id).first()
+        
+        if not stats:
+            raise _not_found(EVENT_NOT_FOUND)
+        
+        attendance_percentage = (stats.attendance / stats.registrations * 100) if stats.registrations > 0 else 0.0
+        
+        event_stats = EventStats(
             event_id=event_id,
-            event_title=event.title,
-            total_registrations=total_registrations,
-            total_attendance=total_attendance,
+            event_title=stats.title,
+            total_registrations=stats.registrations,
+            total_attendance=stats.attendance,
             attendance_percentage=round(attendance_percentage, 2),
-            average_rating=float(feedback_stats.avg_rating) if feedback_stats.avg_rating else None,
-            total_feedback=feedback_stats.count or 0
+            average_rating=float(stats.avg_rating) if stats.avg_rating else None,
+            total_feedback=stats.feedback_count or 0
         )
+        _stats_cache.put(cache_key, event_stats)
+        return event_stats
     
     @staticmethod
-    async def get_student_stats(db: Session, student_id: int):
+    def get_student_stats(db: Session, student_id: int):
         """Get comprehensive statistics for a student"""
-        student = db.query(Student).join(College).filter(Student.id == student_id).first()
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
-        
-        # Get registration count
-        total_registrations = db.query(EventRegistration).filter(
-            EventRegistration.student_id == student_id,
-            EventRegistration.status == "registered"
-        ).count()
-        
-        # Get attendance count
-        total_attendance = db.query(Attendance).filter(
-            Attendance.student_id == student_id,
-            Attendance.attendance_status == "present"
-        ).count()
-        
-        # Get feedback statistics
-        feedback_stats = db.query(
-            func.avg(EventFeedback.rating).label('avg_rating')
-        ).filter(EventFeedback.student_id == student_id).first()
-        
-        attendance_rate = (total_attendance / total_registrations * 100) if total_registrations > 0 else 0
+        stats = db.query(
+            Student.first_name,
+            Student.last_name,
+            College.name.label('college_name'),
+            _subquery(func.count(EventRegistration.id),
+                      EventRegistration.student_id == Student.id,
+                      EventRegistration.status == RegistrationStatus.REGISTERED).label('registrations'),
+            _subquery(func.count(Attendance.id),
+                      Attendance.student_id == Student.id,
+                      Attendance.attendance_status == AttendanceStatus.PRESENT).label('attendance'),
+            _subquery(func.avg(EventFeedback.rating),
+                      EventFeedback.student_id == Student.id).label('avg_rating')
+        ).join(College).filter(Student.id == student_id).first()
+        
+        if not stats:
+            raise _not_found(STUDENT_NOT_FOUND)
+        
+        attendance_rate = (stats.attendance / stats.registrations * 100) if stats.registrations > 0 else 0.0
         
         return StudentStats(
             student_id=student_id,
-            student_name=f"{student.first_name} {student.last_name}",
-            college_name=student.college.name,
-            total_registrations=total_registrations,
-            total_attendance=total_attendance,
+            student_name=f"{stats.first_name} {stats.last_name}",
+            college_name=stats.college_name,
+            total_registrations=stats.registrations,
+            total_attendance=stats.attendance,
             attendance_rate=round(attendance_rate, 2),
-            average_rating_given=float(feedback_stats.avg_rating) if feedback_stats.avg_rating else None
+            average_rating_given=float(stats.avg_rating) if stats.avg_rating else None
         )
     
     @staticmethod
-    async def get_college_stats(db: Session, college_id: int):
+    def get_college_stats(db: Session, college_id: int):
         """Get comprehensive statistics for a college"""
-        college = db.query(College).filter(College.id == college_id).first()
-        if not college:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="College not found"
-            )
-        
-        # Get student count
-        total_students = db.query(Student).filter(Student.college_id == college_id).count()
-        
-        # Get event count
-        total_events = db.query(Event).filter(Event.college_id == college_id).count()
-        
-        # Get total registrations
-        total_registrations = db.query(EventRegistration).join(Student).filter(
-            Student.college_id == college_id,
-            EventRegistration.status == "registered"
-        ).count()
-        
-        # Get average attendance rate
-        attendance_stats = db.query(
-            func.count(Attendance.id).label('attendance_count')
-        ).join(Student).filter(
-            Student.college_id == college_id,
-            Attendance.attendance_status == "present"
-        ).first()
-        
-        # Get average event rating
-        rating_stats = db.query(
-            func.avg(EventFeedback.rating).label('avg_rating')
-        ).join(Student).filter(Student.college_id == college_id).first()
-        
-        attendance_rate = (attendance_stats.attendance_count / total_registrations * 100) if total_registrations > 0 else 0
-        
-        return CollegeStats(
+        cache_key = ("college", college_id, _college_generation)
+        cached = _stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        stats = db.query(
+            College.name,
+            _subquery(func.count(Student.id),
+                      Student.college_id == College.id).label('students'),
+            _subquery(func.count(Event.id),
+                      Event.college_id == College.id).label('events'),
+            _subquery(func.count(EventRegistration.id),
+                      Student.college_id == College.id,
+                      EventRegistration.status == RegistrationStatus.REGISTERED,
+                      join=Student).label('registrations'),
+            _subquery(func.count(Attendance.id),
+                      Student.college_id == College.id,
+                      Attendance.attendance_status == AttendanceStatus.PRESENT,
+                      join=Student).label('attendance'),
+            _subquery(func.avg(EventFeedback.rating),
+                      Student.college_id == College.id,
+                      join=Student).label('avg_rating')
+        ).filter(College.id == college_id).first()
+        
+        if not stats:
+            raise _not_found(COLLEGE_NOT_FOUND)
+        
+        attendance_rate = (stats.attendance / stats.registrations * 100) if stats.registrations > 0 else 0.0
+        
+        college_stats = CollegeStats(
             college_id=college_id,
-            college_name=college.name,
-            total_students=total_students,
-            total_events=total_events,
-            total_registrations=total_registrations,
+            college_name=stats.name,
+            total_students=stats.students,
+            total_events=stats.events,
+            total_registrations=stats.registrations,
             average_attendance_rate=round(attendance_rate, 2),
-            average_event_rating=float(rating_stats.avg_rating) if rating_stats.avg_rating else None
+            average_event_rating=float(stats.avg_rating) if stats.avg_rating else None
         )
+        _stats_cache.put(cache_key, college_stats)
+        return college_stats
     
     @staticmethod
-    async def get_event_participation_report(
+    def get_event_participation_report(
         db: Session,
         college_id: Optional[int] = None,
         event_type: Optional[EventType] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ):
-        """Get comprehensive event participation report"""
-        query = db.query(Event).join(College)
+        """Get comprehensive event participation report, yielded row by row in ranking order"""
+        registrations = _grouped(
+            EventRegistration.event_id,
+            func.count(EventRegistration.id).filter(EventRegistration.status == RegistrationStatus.REGISTERED).label('count')
+        )
+        attendance = _grouped(
+            Attendance.event_id,
+            func.count(Attendance.id).filter(Attendance.attendance_status == AttendanceStatus.PRESENT).label('count')
+        )
+        feedback = _grouped(
+            EventFeedback.event_id,
+            func.count(EventFeedback.id).label('count'),
+            func.avg(EventFeedback.rating).label('avg_rating')
+        )
+        total_registrations = func.coalesce(registrations.c.count, 0).label('total_registrations')
+        
+        # All metrics come back in one grouped query, already ranked by registrations
+        query = db.query(
+            Event.id,
+            Event.title,
+            Event.event_type,
+            Event.start_date,
+            Event.max_capacity,
+            College.name.label('college_name'),
+            total_registrations,
+            func.coalesce(attendance.c.count, 0).label('attendance_count'),
+            func.coalesce(feedback.c.count, 0).label('feedback_count'),
+            feedback.c.avg_rating
+        ).join(College) \
+         .outerjoin(registrations, registrations.c.key == Event.id) \
+         .outerjoin(attendance, attendance.c.key == Event.id) \
+         .outerjoin(feedback, feedback.c.key == Event.id)
         
         if college_id:
             query = query.filter(Event.college_id == college_id)
@@ -407,95 +498,102 @@ class ReportService:
         if end_date:
             query = query.filter(Event.start_date <= end_date)
         
-        events = query.all()
-        report = []
-        
-        for event in events:
-            # Get registration count
-            total_registrations = db.query(EventRegistration).filter(
-                EventRegistration.event_id == event.id,
-                EventRegistration.status == "registered"
-            ).count()
-            
-            # Get attendance count
-            attendance_count = db.query(Attendance).filter(
-                Attendance.event_id == event.id,
-                Attendance.attendance_status == "present"
-            ).count()
+        # Fetch through a server-side cursor in batches, so memory stays flat however many events match
+        for row in query.order_by(desc(total_registrations), Event.id).yield_per(500):
+            attendance_percentage = (row.attendance_count / row.total_registrations * 100) if row.total_registrations > 0 else 0.0
+            capacity_utilization = (row.total_registrations / row.max_capacity * 100) if row.max_capacity else None
             
-            # Get feedback statistics
-            feedback_stats = db.query(
-                func.count(EventFeedback.id).label('count'),
-                func.avg(EventFeedback.rating).label('avg_rating')
-            ).filter(EventFeedback.event_id == event.id).first()
-            
-            attendance_percentage = (attendance_count / total_registrations * 100) if total_registrations > 0 else 0
-            capacity_utilization = (total_registrations / event.max_capacity * 100) if event.max_capacity else None
-            
-            report.append(EventParticipationReport(
-                event_id=event.id,
-                event_title=event.title,
-                event_type=event.event_type or "Other",
-                college_name=event.college.name,
-                start_date=event.start_date,
-                total_registrations=total_registrations,
-                attendance_count=attendance_count,
+            yield EventParticipationReport(
+                event_id=row.id,
+                event_title=row.title,
+                event_type=_EVENT_TYPE_LABELS.get(row.event_type, "Other"),
+                college_name=row.college_name,
+                start_date=row.start_date,
+                total_registrations=row.total_registrations,
+                attendance_count=row.attendance_count,
                 attendance_percentage=round(attendance_percentage, 2),
-                average_rating=float(feedback_stats.avg_rating) if feedback_stats.avg_rating else None,
-                feedback_count=feedback_stats.count or 0,
+                average_rating=float(row.avg_rating) if row.avg_rating else None,
+                feedback_count=row.feedback_count,
                 capacity_utilization=round(capacity_utilization, 2) if capacity_utilization else None
-            ))
-        
-        return sorted(report, key=lambda x: x.total_registrations, reverse=True)
+            )
     
     @staticmethod
-    async def get_top_students_report(db: Session, college_id: Optional[int] = None, limit: int = 10):
+    def get_top_students_report(db: Session, college_id: Optional[int] = None, limit: int = 10):
         """Get top most active students"""
-        query = db.query(Student).join(College)
+        attendance = _grouped(
+            Attendance.student_id,
+            func.count(Attendance.id).filter(Attendance.attendance_status == AttendanceStatus.PRESENT).label('count')
+        )
+        feedback = _grouped(
+            EventFeedback.student_id,
+            func.avg(EventFeedback.rating).label('avg_rating')
+        )
+        total_attendance = func.coalesce(attendance.c.count, 0)
+        
+        # Participation score (attendance + feedback quality) is ranked and cut to `limit` in the database
+        participation_score = (total_attendance + func.coalesce(feedback.c.avg_rating, 0) * 0.5).label('participation_score')
+        
+        query = db.query(
+            Student.id,
+            Student.first_name,
+            Student.last_name,
+            College.name.label('college_name'),
+            total_attendance.label('total_attendance'),
+            feedback.c.avg_rating,
+            participation_score
+        ).join(College) \
+         .outerjoin(attendance, attendance.c.key == Student.id) \
+         .outerjoin(feedback, feedback.c.key == Student.id)
         
         if college_id:
             query = query.filter(Student.college_id == college_id)
         
-        students = query.all()
-        student_stats = []
-        
-        for student in students:
-            # Get attendance count
-            total_attendance = db.query(Attendance).filter(
-                Attendance.student_id == student.id,
-                Attendance.attendance_status == "present"
-            ).count()
-            
-            # Get feedback statistics
-            feedback_stats = db.query(
-                func.avg(EventFeedback.rating).label('avg_rating')
-            ).filter(EventFeedback.student_id == student.id).first()
-            
-            # Calculate participation score (attendance + feedback quality)
-            participation_score = total_attendance
-            if feedback_stats.avg_rating:
-                participation_score += float(feedback_stats.avg_rating) * 0.5
-            
-            student_stats.append(TopStudentsReport(
-                student_id=student.id,
-                student_name=f"{student.first_name} {student.last_name}",
-                college_name=student.college.name,
-                participation_score=round(participation_score, 2),
-                total_events_attended=total_attendance,
-                average_rating_given=float(feedback_stats.avg_rating) if feedback_stats.avg_rating else None
-            ))
-        
-        return sorted(student_stats, key=lambda x: x.participation_score, reverse=True)[:limit]
+        return [
+            TopStudentsReport(
+                student_id=row.id,
+                student_name=f"{row.first_name} {row.last_name}",
+                college_name=row.college_name,
+                participation_score=round(float(row.participation_score), 2),
+                total_events_attended=row.total_attendance,
+                average_rating_given=float(row.avg_rating) if row.avg_rating else None
+            )
+            for row in query.order_by(desc(participation_score), Student.id).limit(limit)
+        ]
     
     @staticmethod
-    async def get_event_popularity_report(
+    def get_event_popularity_report(
         db: Session,
         college_id: Optional[int] = None,
         event_type: Optional[EventType] = None,
         limit: int = 10
     ):
         """Get event popularity ranking"""
-        query = db.query(Event)
+        registrations = _grouped(
+            EventRegistration.event_id,
+            func.count(EventRegistration.id).filter(EventRegistration.status == RegistrationStatus.REGISTERED).label('count')
+        )
+        attendance = _grouped(
+            Attendance.event_id,
+            func.count(Attendance.id).filter(Attendance.attendance_status == AttendanceStatus.PRESENT).label('count')
+        )
+        feedback = _grouped(
+            EventFeedback.event_id,
+            func.count(EventFeedback.id).label('count'),
+            func.avg(EventFeedback.rating).label('avg_rating')
+        )
+        total_registrations = func.coalesce(registrations.c.count, 0).label('total_registrations')
+        
+        # Rank and cut to `limit` in the database instead of sorting every event in Python
+        query = db.query(
+            Event.id,
+            Event.title,
+            total_registrations,
+            func.coalesce(attendance.c.count, 0).label('total_attendance'),
+            func.coalesce(feedback.c.count, 0).label('feedback_count'),
+            feedback.c.avg_rating
+        ).outerjoin(registrations, registrations.c.key == Event.id) \
+         .outerjoin(attendance, attendance.c.key == Event.id) \
+         .outerjoin(feedback, feedback.c.key == Event.id)
         
         if college_id:
             query = query.filter(Event.college_id == college_id)
@@ -503,39 +601,19 @@ class ReportService:
         if event_type:
             query = query.filter(Event.event_type == event_type)
         
-        events = query.all()
         event_stats = []
         
-        for event in events:
-            # Get registration count
-            total_registrations = db.query(EventRegistration).filter(
-                EventRegistration.event_id == event.id,
-                EventRegistration.status == "registered"
-            ).count()
-            
-            # Get attendance count
-            total_attendance = db.query(Attendance).filter(
-                Attendance.event_id == event.id,
-                Attendance.attendance_status == "present"
-            ).count()
-            
-            # Get feedback statistics
-            feedback_stats = db.query(
-                func.count(EventFeedback.id).label('count'),
-                func.avg(EventFeedback.rating).label('avg_rating')
-            ).filter(EventFeedback.event_id == event.id).first()
-            
-            attendance_percentage = (total_attendance / total_registrations * 100) if total_registrations > 0 else 0
+        for row in query.order_by(desc(total_registrations), Event.id).limit(limit):
+            attendance_percentage = (row.total_attendance / row.total_registrations * 100) if row.total_registrations > 0 else 0.0
             
             event_stats.append(EventStats(
-                event_id=event.id,
-                event_title=event.title,
-                total_registrations=total_registrations,
-                total_attendance=total_attendance,
+                event_id=row.id,
+                event_title=row.title,
+                total_registrations=row.total_registrations,
+                total_attendance=row.total_attendance,
                 attendance_percentage=round(attendance_percentage, 2),
-                average_rating=float(feedback_stats.avg_rating) if feedback_stats.avg_rating else None,
-                total_feedback=feedback_stats.count or 0
+                average_rating=float(row.avg_rating) if row.avg_rating else None,
+                total_feedback=row.feedback_count
             ))
         
-        return sorted(event_stats, key=lambda x: x.total_registrations, reverse=True)[:limit]
-
+        return event_stats